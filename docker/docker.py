@@ -3,10 +3,17 @@
 # dependencies = ["rich", "simple-term-menu"]
 # ///
 
+import json
+import operator
+import os
 import re
+import selectors
+import signal
 import subprocess
 import sys
+import tempfile
 import time
+from collections import namedtuple
 from datetime import datetime
 
 from rich.console import Console
@@ -16,11 +23,66 @@ from simple_term_menu import TerminalMenu
 
 console = Console()
 
+# Padrões pré-compilados usados no parsing da saída do Docker
+_PORT_RE = re.compile(r"(?:0\.0\.0\.0|::|\[::\]):(\d+)->(?:(\d+)/(\w+))?")
+# Tokenizers de linhas "campo|campo|..." aplicados sobre a saída inteira;
+# o último campo do ps (portas) é opcional para tolerar saídas sem ele
+_PS_RE = re.compile(
+    r"^([^|\n]*)\|([^|\n]*)\|([^|\n]*)\|([^|\n]*)\|([^|\n]*)(?:\|([^\n]*))?$",
+    re.MULTILINE,
+)
+_NETWORK_RE = re.compile(r"^([^|\n]*)\|([^|\n]*)\|([^|\n]*)\|([^\n]*)$", re.MULTILINE)
+_IMAGES_RE = re.compile(
+    r"^([^|\n]*)\|([^|\n]*)\|([^|\n]*)\|([^|\n]*)\|([^\n]*)$", re.MULTILINE
+)
+
+# Linha da tabela de portas, também usada pelos menus interativos
+PortRow = namedtuple(
+    "PortRow",
+    "host_port ports_display protocol container_id container_name image status",
+)
+
+# Configuração comum dos menus interativos (simple-term-menu)
+_MENU_KW = {"menu_cursor": "=> ", "cycle_cursor": True, "clear_screen": False}
+
+# Intervalos do modo watch (em segundos)
+WATCH_POLL_INTERVAL = 2  # Polling quando docker events não está disponível
+WATCH_EVENTS_TIMEOUT = 10  # Refresh mínimo mesmo sem eventos (status/uptime)
+WATCH_EVENTS_DEBOUNCE = 0.2  # Janela para agrupar rajadas de eventos
+WATCH_EVENTS_MAX_DELAY = 1.0  # Espera máxima após o primeiro evento da rajada
+
+# Cache da última saída do docker ps, compartilhada entre as tabelas
+PS_CACHE_TTL = 1.0
+_PS_CACHE = {"raw": None, "ts": 0.0}
+# Campos do docker ps na ordem lida por _PS_RE; a data já vem truncada em
+# YYYY-MM-DD HH:MM:SS pelo template do Docker
+_PS_FORMAT = (
+    '{{.ID}}|{{.Names}}|{{.Image}}|{{printf "%.19s" .CreatedAt}}|{{.Status}}|{{.Ports}}'
+)
+
+
+def _run_captured(cmd):
+    """Run cmd and return a CompletedProcess with decoded stdout/stderr
+
+    Output goes to temporary files instead of pipes, so the child writes
+    without pipe back-pressure and the result is read back in one go.
+    """
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        process = subprocess.run(cmd, stdout=out, stderr=err)
+        out.seek(0)
+        err.seek(0)
+        return subprocess.CompletedProcess(
+            cmd,
+            process.returncode,
+            out.read().decode(errors="replace"),
+            err.read().decode(errors="replace"),
+        )
+
 
 def run_command(cmd):
-    """Execute a shell command and return output"""
+    """Execute a command (argv list, without a shell) and return output"""
     try:
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        result = _run_captured(cmd)
         if result.returncode != 0:
             # Se comando falhou, pode ser problema de Docker
             if (
@@ -42,16 +104,26 @@ def run_command(cmd):
         return ""
 
 
-def format_date(date_str):
-    """Convert Docker date format to YYYY-MM-DD HH:MM:SS"""
-    try:
-        # Docker format: "2025-06-24 09:55:20 -0300 -03"
-        # Remove timezone part and parse
-        date_part = re.sub(r" -\d{4} -\d{2}$", "", date_str.strip())
-        dt = datetime.strptime(date_part, "%Y-%m-%d %H:%M:%S")
-        return dt.strftime("%Y-%m-%d %H:%M:%S")
-    except:
-        return date_str  # Return original if parsing fails
+def _parse_port_mapping(part):
+    """Return (host_port, container_port, protocol) for a published mapping, or None"""
+    # Caminho rápido para o caso comum: 0.0.0.0:8080->80/tcp
+    if part.startswith("0.0.0.0:"):
+        arrow = part.find("->", 8)
+        host = part[8:arrow]
+        if arrow < 0 or not host.isdigit():
+            return None
+        slash = part.find("/", arrow + 2)
+        container_port = part[arrow + 2 : slash]
+        if slash < 0 or not container_port.isdigit():
+            return int(host), "unknown", "tcp"
+        return int(host), container_port, part[slash + 1 :]
+
+    # IPv6 ([::]:8080->80/tcp ou :::8080->80/tcp): a regex captura porta do
+    # host, porta do container e protocolo em uma única varredura
+    match = _PORT_RE.search(part)
+    if not match:
+        return None
+    return int(match.group(1)), match.group(2) or "unknown", match.group(3) or "tcp"
 
 
 def parse_ports(port_string):
@@ -65,14 +137,9 @@ def parse_ports(port_string):
 
     for part in port_parts:
         part = part.strip()
-        # Match patterns like: 0.0.0.0:8080->80/tcp or [::]:8080->80/tcp
-        match = re.search(r"(?:0\.0\.0\.0|::|\[::\]):(\d+)->", part)
-        if match:
-            host_port = int(match.group(1))
-            # Extract container port and protocol
-            container_match = re.search(r"->(\d+)/(\w+)", part)
-            container_port = container_match.group(1) if container_match else "unknown"
-            protocol = container_match.group(2) if container_match else "tcp"
+        mapping = _parse_port_mapping(part)
+        if mapping:
+            host_port, container_port, protocol = mapping
 
             # Create unique key for host_port + container_port combination
             port_key = f"{host_port}->{container_port}"
@@ -81,16 +148,21 @@ def parse_ports(port_string):
                 ports_dict[port_key] = {
                     "host_port": host_port,
                     "container_port": container_port,
-                    "protocols": set(),
+                    "protocols": [],
                     "mapping": part,
                 }
 
-            ports_dict[port_key]["protocols"].add(protocol)
+            protocols_list = ports_dict[port_key]["protocols"]
+            if protocol not in protocols_list:
+                protocols_list.append(protocol)
 
     # Convert to list and sort protocols
     ports = []
     for port_info in ports_dict.values():
-        protocols_list = sorted(list(port_info["protocols"]))
+        protocols_list = port_info["protocols"]
+        # Caso comum (um único protocolo) dispensa a ordenação
+        if len(protocols_list) > 1:
+            protocols_list.sort()
         ports.append(
             {
                 "host_port": port_info["host_port"],
@@ -100,11 +172,26 @@ def parse_ports(port_string):
             }
         )
 
-    return sorted(ports, key=lambda x: x["host_port"])
+    ports.sort(key=operator.itemgetter("host_port"))
+    return ports
 
 
-def create_ps_table():
-    """Create table for docker ps"""
+def _get_ps_raw(ttl=PS_CACHE_TTL):
+    """Return raw docker ps output, reusing a recent result within ttl seconds"""
+    now = time.time()
+    if _PS_CACHE["raw"] is None or now - _PS_CACHE["ts"] > ttl:
+        _PS_CACHE["raw"] = run_command(["docker", "ps", "--format", _PS_FORMAT])
+        _PS_CACHE["ts"] = now
+    return _PS_CACHE["raw"]
+
+
+def _invalidate_ps_cache():
+    """Force the next _get_ps_raw call to query Docker again"""
+    _PS_CACHE["raw"] = None
+
+
+def _new_ps_table():
+    """Create the empty containers table with its columns"""
     table = Table(
         title="Docker Containers", show_header=True, header_style="bold magenta"
     )
@@ -113,24 +200,38 @@ def create_ps_table():
     table.add_column("CREATED", style="blue")
     table.add_column("STATUS", style="magenta")
     table.add_column("PORTS", style="yellow")
+    return table
 
-    output = run_command(
-        'docker ps --format "{{.ID}}|{{.Image}}|{{.CreatedAt}}|{{.Status}}|{{.Ports}}"'
-    )
 
-    for line in output.split("\n"):
-        if line.strip():
-            parts = line.split("|")
-            if len(parts) >= 5:
-                created_formatted = format_date(parts[2])
-                table.add_row(parts[0], parts[1], created_formatted, parts[3], parts[4])
-            elif len(parts) == 4:
-                created_formatted = format_date(parts[2])
-                table.add_row(parts[0], parts[1], created_formatted, parts[3], "")
+def _clear_table_rows(table):
+    """Remove all rows from a Rich table, keeping its columns and styles"""
+    table.rows.clear()
+    for column in table.columns:
+        column._cells.clear()
+
+
+def _build_ps_table(output, table=None):
+    """Build the containers table from raw docker ps output
+
+    When an existing table is given, its rows are replaced in place.
+    """
+    if table is None:
+        table = _new_ps_table()
+    else:
+        _clear_table_rows(table)
+
+    for m in _PS_RE.finditer(output):
+        container_id, _name, image, created, status, ports = m.groups("")
+        table.add_row(container_id, image, created, status, ports)
 
     return table
 
 
+def create_ps_table():
+    """Create table for docker ps"""
+    return _build_ps_table(_get_ps_raw())
+
+
 def create_ports_table():
     """Create table for exposed ports"""
     table = Table(title="Exposed Ports", show_header=True, header_style="bold magenta")
@@ -141,60 +242,48 @@ def create_ports_table():
     table.add_column("IMAGE", style="white")
     table.add_column("STATUS", style="magenta")
 
-    output = run_command(
-        'docker ps --format "{{.ID}}|{{.Names}}|{{.Image}}|{{.Status}}|{{.Ports}}"'
-    )
+    output = _get_ps_raw()
 
     # Collect all port mappings
     port_mappings = []
 
-    for line in output.split("\n"):
-        if line.strip():
-            parts = line.split("|")
-            if len(parts) >= 5:
-                container_id = parts[0]
-                container_name = parts[1]
-                image = parts[2]
-                status = parts[3]
-                ports_str = parts[4]
-
-                # Parse ports for this container
-                ports = parse_ports(ports_str)
-
-                for port_info in ports:
-                    # Format ports column: show host port, add container port in parentheses if different
-                    if str(port_info["host_port"]) == port_info["container_port"]:
-                        ports_display = str(port_info["host_port"])
-                    else:
-                        ports_display = (
-                            f"{port_info['host_port']} ({port_info['container_port']})"
-                        )
-
-                    port_mappings.append(
-                        {
-                            "host_port": port_info["host_port"],
-                            "ports_display": ports_display,
-                            "protocol": port_info["protocol"],
-                            "container_id": container_id[:12],
-                            "container_name": container_name,
-                            "image": image,
-                            "status": status,
-                        }
-                    )
+    for m in _PS_RE.finditer(output):
+        container_id, container_name, image, _created, status, ports_str = m.groups("")
+
+        # Containers sem portas publicadas não precisam de parsing
+        if "->" not in ports_str:
+            continue
+
+        # Parse ports for this container
+        ports = parse_ports(ports_str)
+
+        for port_info in ports:
+            # Format ports column: show host port, add container port in parentheses if different
+            if str(port_info["host_port"]) == port_info["container_port"]:
+                ports_display = str(port_info["host_port"])
+            else:
+                ports_display = (
+                    f"{port_info['host_port']} ({port_info['container_port']})"
+                )
+
+            port_mappings.append(
+                PortRow(
+                    port_info["host_port"],
+                    ports_display,
+                    port_info["protocol"],
+                    container_id[:12],
+                    container_name,
+                    image,
+                    status,
+                )
+            )
 
     # Sort by host port
-    port_mappings.sort(key=lambda x: x["host_port"])
+    port_mappings.sort(key=operator.itemgetter(0))
 
-    # Add rows to table
+    # Add rows to table (all fields except host_port)
     for mapping in port_mappings:
-        table.add_row(
-            mapping["ports_display"],
-            mapping["protocol"],
-            mapping["container_id"],
-            mapping["container_name"],
-            mapping["image"],
-            mapping["status"],
-        )
+        table.add_row(*mapping[1:])
 
     return table, port_mappings
 
@@ -210,14 +299,17 @@ def create_network_table():
     table.add_column("SCOPE", style="blue")
 
     output = run_command(
-        'docker network ls --format "{{.ID}}|{{.Name}}|{{.Driver}}|{{.Scope}}"'
+        [
+            "docker",
+            "network",
+            "ls",
+            "--format",
+            "{{.ID}}|{{.Name}}|{{.Driver}}|{{.Scope}}",
+        ]
     )
 
-    for line in output.split("\n"):
-        if line.strip():
-            parts = line.split("|")
-            if len(parts) >= 4:
-                table.add_row(parts[0], parts[1], parts[2], parts[3])
+    for m in _NETWORK_RE.finditer(output):
+        table.add_row(*m.groups())
 
     return table
 
@@ -232,72 +324,153 @@ def create_images_table():
     table.add_column("SIZE", style="yellow")
 
     output = run_command(
-        'docker images --format "{{.Repository}}|{{.Tag}}|{{.ID}}|{{.CreatedAt}}|{{.Size}}"'
+        [
+            "docker",
+            "images",
+            "--format",
+            '{{.Repository}}|{{.Tag}}|{{.ID}}|{{printf "%.19s" .CreatedAt}}|{{.Size}}',
+        ]
     )
 
-    for line in output.split("\n"):
-        if line.strip():
-            parts = line.split("|")
-            if len(parts) >= 5:
-                created_formatted = format_date(parts[3])
-                table.add_row(parts[0], parts[1], parts[2], created_formatted, parts[4])
+    for m in _IMAGES_RE.finditer(output):
+        repository, tag, image_id, created, size = m.groups()
+        table.add_row(repository, tag, image_id, created, size)
 
     return table
 
 
+def _start_events_stream():
+    """Start a docker events process that reports container changes"""
+    try:
+        return subprocess.Popen(
+            [
+                "docker",
+                "events",
+                "--format",
+                "{{json .}}",
+                "--filter",
+                "type=container",
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            # Sem buffer: todo dado pendente fica visível para o select
+            bufsize=0,
+        )
+    except OSError:
+        return None
+
+
 def watch_containers():
     """Continuously monitor containers"""
+    events = _start_events_stream()
+    selector = selectors.DefaultSelector()
+    if events:
+        selector.register(events.stdout, selectors.EVENT_READ)
+
     try:
-        with Live(console=console, refresh_per_second=1) as live:
+        # Tabela criada uma vez; a cada mudança apenas as linhas são trocadas
+        table = _new_ps_table()
+        # Sem auto refresh: só renderiza quando há dados novos
+        with Live(table, console=console, auto_refresh=False) as live:
+            last_hash = None
             while True:
-                table = create_ps_table()
-                live.update(table)
-                time.sleep(2)
+                # Saída igual à anterior: nada a reconstruir nem a atualizar
+                raw = _get_ps_raw(ttl=0)
+                raw_hash = hash(raw)
+                if raw_hash != last_hash:
+                    _build_ps_table(raw, table)
+                    last_hash = raw_hash
+                    live.update(table, refresh=True)
+
+                if not selector.get_map():
+                    # Sem stream de eventos: volta ao polling periódico
+                    time.sleep(WATCH_POLL_INTERVAL)
+                    continue
+
+                # Aguarda um evento de container ou o timeout de fallback
+                timeout = WATCH_EVENTS_TIMEOUT
+                deadline = None
+                while selector.select(timeout=timeout):
+                    # O conteúdo dos eventos não é usado: só esvazia o pipe
+                    if not os.read(events.stdout.fileno(), 65536):
+                        # docker events terminou
+                        selector.unregister(events.stdout)
+                        break
+                    # Agrupa rajadas de eventos (create, start, ...) em um
+                    # refresh, sem adiar além de WATCH_EVENTS_MAX_DELAY
+                    now = time.monotonic()
+                    if deadline is None:
+                        deadline = now + WATCH_EVENTS_MAX_DELAY
+                    timeout = min(WATCH_EVENTS_DEBOUNCE, deadline - now)
+                    if timeout <= 0:
+                        break
     except KeyboardInterrupt:
         console.print("\n[yellow]Monitor interrompido[/yellow]")
+    finally:
+        selector.close()
+        if events:
+            events.terminate()
+            events.wait()
 
 
 def get_container_details(container_id):
     """Get detailed information about a container"""
     try:
-        # Get basic info with docker ps
-        ps_output = run_command(
-            f'docker ps --filter "id={container_id}" --format "{{{{.ID}}}}|{{{{.Names}}}}|{{{{.Image}}}}|{{{{.Status}}}}|{{{{.CreatedAt}}}}|{{{{.Ports}}}}"'
-        )
-
-        if not ps_output:
+        # Uma única chamada ao docker inspect, com o JSON interpretado localmente
+        result = _run_captured(["docker", "inspect", container_id])
+        if result.returncode != 0 or not result.stdout.strip():
             return None
 
-        parts = ps_output.split("|")
-        if len(parts) < 5:
-            return None
+        info = json.loads(result.stdout)[0]
+        config = info.get("Config") or {}
+        state = info.get("State") or {}
+        network_settings = info.get("NetworkSettings") or {}
+        host_config = info.get("HostConfig") or {}
 
-        details = {
-            "id": parts[0],
-            "name": parts[1],
-            "image": parts[2],
-            "status": parts[3],
-            "created": format_date(parts[4]) if len(parts) > 4 else "Unknown",
-            "ports": parts[5] if len(parts) > 5 else "None",
-        }
+        # Docker format: "2025-06-24T12:55:20.123456789Z" (UTC)
+        created = info.get("Created", "")
+        try:
+            created = (
+                datetime.fromisoformat(created[:19] + "+00:00")
+                .astimezone()
+                .strftime("%Y-%m-%d %H:%M:%S")
+            )
+        except ValueError:
+            created = created or "Unknown"
+
+        ports = []
+        for container_port, bindings in (network_settings.get("Ports") or {}).items():
+            if not bindings:
+                ports.append(container_port)
+                continue
+            for binding in bindings:
+                ports.append(
+                    f"{binding.get('HostIp', '')}:{binding.get('HostPort', '')}->{container_port}"
+                )
 
-        # Get network info safely
-        network_output = run_command(
-            f'docker inspect {container_id} --format "{{{{range .NetworkSettings.Networks}}}}{{{{.IPAddress}}}}{{{{end}}}}"'
-        )
-        details["networks"] = network_output.strip() if network_output else "Unknown"
+        networks = [
+            network.get("IPAddress", "")
+            for network in (network_settings.get("Networks") or {}).values()
+            if network.get("IPAddress")
+        ]
 
-        # Get mounts/volumes safely
-        mounts_output = run_command(
-            f'docker inspect {container_id} --format "{{{{range .Mounts}}}}{{{{.Source}}}}:{{{{.Destination}}}} {{{{end}}}}"'
-        )
-        details["mounts"] = mounts_output.strip() if mounts_output else "None"
+        mounts = [
+            f"{mount.get('Source', '')}:{mount.get('Destination', '')}"
+            for mount in info.get("Mounts") or []
+        ]
 
-        # Get additional info safely
-        restart_policy = run_command(
-            f'docker inspect {container_id} --format "{{{{.HostConfig.RestartPolicy.Name}}}}"'
-        )
-        details["restart_policy"] = restart_policy.strip() if restart_policy else "none"
+        details = {
+            "id": info.get("Id", container_id)[:12],
+            "name": info.get("Name", "").lstrip("/"),
+            "image": config.get("Image", ""),
+            "status": state.get("Status", ""),
+            "created": created,
+            "ports": ", ".join(ports) if ports else "None",
+            "networks": ", ".join(networks) if networks else "Unknown",
+            "mounts": " ".join(mounts) if mounts else "None",
+            "restart_policy": (host_config.get("RestartPolicy") or {}).get("Name")
+            or "none",
+        }
 
         return details
 
@@ -307,47 +480,53 @@ def get_container_details(container_id):
 
 
 def show_container_logs(container_id):
-    """Show container logs with real-time following"""
+    """Show container logs with real-time following (expects the short ID)"""
     try:
-        console.print(f"[green]Logs do container {container_id[:12]}...[/green]")
+        console.print(f"[green]Logs do container {container_id}...[/green]")
         console.print("[dim]Pressione Ctrl+C para parar[/dim]\n")
 
-        # Use subprocess with real-time output
-        process = subprocess.Popen(
+        # Use subprocess with real-time output (raw bytes, sem buffer)
+        # O with aguarda o término do processo, evitando zumbis
+        with subprocess.Popen(
             ["docker", "logs", "--tail", "50", "--follow", container_id],
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
-            universal_newlines=True,
-        )
-
-        try:
-            for line in iter(process.stdout.readline, ""):
-                if line:
-                    print(line.rstrip())
-        except KeyboardInterrupt:
-            process.terminate()
-            console.print("\n[yellow]Logs interrompidos[/yellow]")
-        finally:
-            process.terminate()
+            bufsize=0,
+        ) as process:
+            try:
+                # Repassa os blocos direto para o stdout, sem decodificar linha a linha
+                fd = process.stdout.fileno()
+                sys.stdout.flush()
+                out = sys.stdout.buffer
+                while True:
+                    data = os.read(fd, 65536)
+                    if not data:
+                        break
+                    out.write(data)
+                    out.flush()
+            except KeyboardInterrupt:
+                # Deixa o docker encerrar de forma limpa
+                process.send_signal(signal.SIGINT)
+                try:
+                    process.wait(timeout=2)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                console.print("\n[yellow]Logs interrompidos[/yellow]")
 
     except Exception as e:
         console.print(f"[red]Erro ao exibir logs: {e}[/red]")
 
 
 def stop_container_interactive(container_id, container_name):
-    """Stop container with confirmation using simple-term-menu"""
+    """Stop container with confirmation using simple-term-menu (expects the short ID)"""
     try:
         # Use simple-term-menu for confirmation
         choices = ["Sim, parar container", "Cancelar"]
 
         terminal_menu = TerminalMenu(
             choices,
-            title=f"Parar container {container_name} ({container_id[:12]})?",
-            menu_cursor="=> ",
-            cycle_cursor=True,
-            clear_screen=False,
+            title=f"Parar container {container_name} ({container_id})?",
+            **_MENU_KW,
         )
 
         menu_entry_index = terminal_menu.show()
@@ -360,7 +539,8 @@ def stop_container_interactive(container_id, container_name):
         # User confirmed (index 0)
         if menu_entry_index == 0:
             console.print(f"[yellow]Parando container {container_name}...[/yellow]")
-            stop_output = run_command(f"docker stop {container_id}")
+            stop_output = run_command(["docker", "stop", container_id])
+            _invalidate_ps_cache()
             console.print(
                 f"[green]Container {container_name} parado com sucesso[/green]"
             )
@@ -374,27 +554,22 @@ def stop_container_interactive(container_id, container_name):
 def logs_interactive_mode():
     """Interactive mode for container logs selection"""
     try:
-        # Get containers table
-        table = create_ps_table()
-
-        # Get container data
-        output = run_command(
-            'docker ps --format "{{.ID}}|{{.Names}}|{{.Image}}|{{.Status}}"'
-        )
+        # Uma única consulta ao docker ps para a tabela e para a lista
+        output = _get_ps_raw()
+        table = _build_ps_table(output)
 
         containers = []
-        for line in output.split("\n"):
-            if line.strip():
-                parts = line.split("|")
-                if len(parts) >= 4:
-                    containers.append(
-                        {
-                            "id": parts[0],
-                            "name": parts[1],
-                            "image": parts[2],
-                            "status": parts[3],
-                        }
-                    )
+        for m in _PS_RE.finditer(output):
+            container_id, name, image, _created, status, _ports = m.groups("")
+            containers.append(
+                {
+                    "id": container_id,
+                    "short": container_id[:12],
+                    "name": name,
+                    "image": image,
+                    "status": status,
+                }
+            )
 
         if not containers:
             console.print("[yellow]Nenhum container em execução encontrado[/yellow]")
@@ -418,7 +593,7 @@ def logs_interactive_mode():
                 if len(container["image"]) > 30
                 else container["image"]
             )
-            choice = f"{container_name_short} ({container['id'][:12]}) - {image_short}"
+            choice = f"{container_name_short} ({container['short']}) - {image_short}"
             choices.append(choice)
 
         choices.append("Voltar ao menu principal")
@@ -427,10 +602,8 @@ def logs_interactive_mode():
         terminal_menu = TerminalMenu(
             choices,
             title="Selecione um container para logs:",
-            menu_cursor="=> ",
-            cycle_cursor=True,
-            clear_screen=False,
             show_search_hint=True,
+            **_MENU_KW,
         )
 
         menu_entry_index = terminal_menu.show()
@@ -447,7 +620,7 @@ def logs_interactive_mode():
         # Find selected container by index
         if menu_entry_index < len(containers):
             selected_container = containers[menu_entry_index]
-            show_container_logs(selected_container["id"])
+            show_container_logs(selected_container["short"])
 
     except KeyboardInterrupt:
         console.print("\n[yellow]Seleção de logs cancelada[/yellow]")
@@ -475,11 +648,11 @@ def ports_interactive_mode():
             for mapping in port_mappings:
                 # Shorter format: Port -> Container_name (ID)
                 container_name_short = (
-                    mapping["container_name"][:25] + "..."
-                    if len(mapping["container_name"]) > 25
-                    else mapping["container_name"]
+                    mapping.container_name[:25] + "..."
+                    if len(mapping.container_name) > 25
+                    else mapping.container_name
                 )
-                choice = f":{mapping['ports_display']} -> {container_name_short} ({mapping['container_id']})"
+                choice = f":{mapping.ports_display} -> {container_name_short} ({mapping.container_id})"
                 choices.append(choice)
 
             choices.append("Voltar ao menu principal")
@@ -488,10 +661,8 @@ def ports_interactive_mode():
             terminal_menu = TerminalMenu(
                 choices,
                 title="Selecione um container:",
-                menu_cursor="=> ",
-                cycle_cursor=True,
-                clear_screen=False,
                 show_search_hint=True,
+                **_MENU_KW,
             )
 
             menu_entry_index = terminal_menu.show()
@@ -509,7 +680,7 @@ def ports_interactive_mode():
             if menu_entry_index < len(port_mappings):
                 selected_container = port_mappings[menu_entry_index]
                 console.print(
-                    f"[green]Container selecionado: {selected_container['container_name']}[/green]"
+                    f"[green]Container selecionado: {selected_container.container_name}[/green]"
                 )
                 # Container actions menu
                 container_menu(selected_container)
@@ -523,31 +694,25 @@ def ports_interactive_mode():
 def container_menu(container_info):
     """Show menu for container actions"""
     try:
-        container_id = container_info["container_id"]
-        container_name = container_info["container_name"]
+        container_id = container_info.container_id
+        container_name = container_info.container_name
+
+        # Action choices
+        actions = [
+            "Ver detalhes completos",
+            "Acompanhar logs",
+            "Parar container",
+            "Voltar à lista de portas",
+        ]
+
+        # Use simple-term-menu for container actions (menu fixo, criado uma vez)
+        terminal_menu = TerminalMenu(actions, title="Escolha uma ação:", **_MENU_KW)
 
         while True:
             console.print(
                 f"\n[bold cyan]Container: {container_name} ({container_id})[/bold cyan]"
             )
 
-            # Action choices
-            actions = [
-                "Ver detalhes completos",
-                "Acompanhar logs",
-                "Parar container",
-                "Voltar à lista de portas",
-            ]
-
-            # Use simple-term-menu for container actions
-            terminal_menu = TerminalMenu(
-                actions,
-                title="Escolha uma ação:",
-                menu_cursor="=> ",
-                cycle_cursor=True,
-                clear_screen=False,
-            )
-
             menu_entry_index = terminal_menu.show()
 
             # Handle cancellation (Esc or Ctrl+C)
@@ -603,7 +768,8 @@ def show_container_details_full(container_id):
 def check_docker():
     """Check if Docker is accessible"""
     try:
-        result = subprocess.run(["docker", "info"], capture_output=True, text=True)
+        # docker version só consulta a versão do daemon (bem mais rápido que docker info)
+        result = _run_captured(["docker", "version", "--format", "{{.Server.Version}}"])
         if result.returncode != 0:
             console.print("[red]Docker não está acessível[/red]")
             if "Cannot connect to the Docker daemon" in result.stderr:
@@ -2,17 +2,22 @@
 # -*- coding: utf-8 -*-
 """ICMP Monitor - Advanced ICMP monitoring tool with statistical analysis"""
 
+import asyncio
+import atexit
+import bisect
 import json
 import os
+import queue
 import re
+import select
 import shutil
+import signal
 import socket
 import sqlite3
-import subprocess
 import sys
 import threading
 import time
-from datetime import datetime
+from datetime import datetime, timezone
 
 import psutil
 import requests
@@ -22,6 +27,7 @@ from rich.console import Console
 from rich.layout import Layout
 from rich.live import Live
 from rich.panel import Panel
+from rich.style import Style
 from rich.table import Table
 from rich.text import Text
 
@@ -32,31 +38,94 @@ console = Console()
 
 # Otimização: Obter o diretório do script uma vez para evitar chamadas repetidas.
 SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+DB_FILE = os.path.join(SCRIPT_DIR, "icmp_monitor.sqlite3")
 
 # Configurações de tempo de atualização (em segundos)
 PING_UPDATE_INTERVAL = 1.5
 PUBLIC_IP_UPDATE_INTERVAL = 15
-INTERFACE_UPDATE_INTERVAL = 15
+PUBLIC_IP_MAX_AGE = 300  # Consulta forçada mesmo sem mudança nas interfaces
+PUBLIC_IP_TIMEOUT = 3
+INTERFACE_UPDATE_INTERVAL = 15  # Polling quando netlink não está disponível
+NETLINK_DEBOUNCE = 0.5  # Janela para agrupar rajadas de eventos netlink
+NETLINK_MAX_DELAY = 2.0  # Espera máxima após o primeiro evento da rajada
+DB_WRITE_INTERVAL = 1  # Janela de agrupamento das escritas de ping
+DB_CLEANUP_INTERVAL = 3600  # Limpeza de dados antigos (1 hora)
+DNS_CACHE_TTL = 300  # Validade das resoluções DNS em cache
+UI_POLL_INTERVAL = 0.1  # Verificação de mudanças pela interface
+UI_MIN_REFRESH_INTERVAL = 0.5  # Intervalo mínimo entre redesenhos da tela
+
+# Grupos netlink (linux/rtnetlink.h) usados para detectar mudanças de interface
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
 
 # Configurações de estilo das tabelas
 TABLE_STYLE = box.SIMPLE
 HEADER_STYLE = "bold"
 PANELY_STYLE = "bright_blue"
 
+# Estilos da tabela de pings interpretados uma única vez (evita Style.parse
+# por célula a cada refresh)
+_STYLES = {
+    name: Style.parse(name)
+    for name in (
+        "dim",
+        "green",
+        "yellow",
+        "red",
+        "green bold",
+        "red bold",
+        "magenta bold",
+        "dim yellow",
+        "yellow dim",
+        "green dim",
+    )
+}
+
+# Classificação do Z-score da latência atual: |z| <= limite -> estilo
+# (até 1 desvio: normal, 1.5: variável, 2: anômalo, acima: crítico)
+_Z_THRESHOLDS = (1.0, 1.5, 2.0)
+_Z_STYLES = (_STYLES["green"], _STYLES["yellow"], _STYLES["red"], _STYLES["red bold"])
+
+# Resposta do ping: "64 bytes from 1.1.1.1: icmp_seq=1 ttl=57 time=12.3 ms"
+_PING_RE = re.compile(
+    r"^(?P<bytes>\d+) bytes from .*?ttl=(?P<ttl>\d+).*?time=(?P<time>[\d.]+)",
+    re.MULTILINE,
+)
+
+
+# Cache de resoluções DNS: hostname -> (ip, instante da resolução)
+_dns_cache = {}
+
+
+def mark_dirty():
+    """Sinaliza à interface que há dados novos para exibir"""
+    global _dirty_counter
+    _dirty_counter += 1
+
 
 def is_ipv4(addr):
     """Verifica se o endereço é um IPv4 válido"""
-    ipv4_pattern = r"^(?:(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)\.){3}(?:25[0-5]|2[0-4][0-9]|[01]?[0-9][0-9]?)$"
-    return re.match(ipv4_pattern, addr) is not None
+    try:
+        socket.inet_pton(socket.AF_INET, addr)
+        return True
+    except OSError:
+        return False
 
 
 def resolve_dns(hostname):
-    """Resolve um hostname para IPv4"""
+    """Resolve um hostname para IPv4, reaproveitando resultados recentes"""
+    now = time.monotonic()
+    cached = _dns_cache.get(hostname)
+    if cached and now - cached[1] < DNS_CACHE_TTL:
+        return cached[0]
+
     try:
         resolved_ip = socket.gethostbyname(hostname)
-        return resolved_ip
-    except socket.gaierror:
+    except (OSError, UnicodeError):
+        # gaierror, ou nome inválido (ex.: rótulo com mais de 63 caracteres)
         return None
+    _dns_cache[hostname] = (resolved_ip, now)
+    return resolved_ip
 
 
 def create_default_config():
@@ -118,7 +187,35 @@ network_interfaces = []
 
 # Variáveis para estatísticas SQLite
 stats_data = {}
-db_lock = threading.Lock()
+
+# Contador de mudanças nos dados exibidos; a tela só é redesenhada quando
+# ele muda (ou na virada de cada segundo, para o relógio)
+_dirty_counter = 0
+
+# Fila de resultados de ping consumida pela thread de escrita (db_writer)
+ping_write_queue = queue.Queue()
+# Marcador enfileirado na saída para a db_writer gravar o último lote e parar
+_WRITER_STOP = None
+_writer_thread = None
+
+# Conexões SQLite persistentes, uma por thread (ver get_db_connection)
+_db_local = threading.local()
+_db_connections = []  # (thread dona, conexão)
+
+# Processos ping contínuos em execução, encerrados na saída do programa
+_ping_processes = set()
+
+# Painéis reaproveitados entre refreshes enquanto seus dados não mudam
+_panel_cache = {}
+
+# Relógio do painel Info, reformatado apenas quando o segundo muda
+_clock_cache = {"second": None, "text": ""}
+
+# Sessão HTTP persistente (keep-alive) para a consulta do IP público
+_ip_session = requests.Session()
+_ip_session.mount(
+    "https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=1)
+)
 
 
 # =============================================================================
@@ -138,15 +235,12 @@ def init_database():
     - WAL mode: Escritas não bloqueiam leituras (essencial para tempo real)
     - Cache grande: 10MB para consultas rápidas em janelas temporais
     - Sincronização normal: Balance entre performance e integridade
-    """
-    db_file = os.path.join(SCRIPT_DIR, "icmp_monitor.sqlite3")
-
-    with sqlite3.connect(db_file) as conn:
-        # OTIMIZAÇÕES PARA ANÁLISE EM TEMPO REAL
-        conn.execute("PRAGMA journal_mode=WAL")  # Leituras concorrentes
-        conn.execute("PRAGMA synchronous=NORMAL")  # Performance vs segurança
-        conn.execute("PRAGMA cache_size=10000")  # 10MB cache para consultas
+    - mmap e temp_store em memória: Leituras e agregações sem I/O extra
+    - auto_vacuum incremental: Páginas liberadas pela limpeza voltam ao disco
 
+    Os PRAGMAs são aplicados por conexão em get_db_connection().
+    """
+    with get_db_connection() as conn:
         # TABELA DE TARGETS - Mantém os targets de monitoramento atualizados
         conn.execute("""
             CREATE TABLE IF NOT EXISTS ping_targets (
@@ -201,81 +295,70 @@ def init_database():
             "CREATE INDEX IF NOT EXISTS idx_ping_targets_id ON ping_targets(target_id)"
         )
 
-        # VIEWS OTIMIZADAS PARA CONSULTAS RECORRENTES
-        # Estas views simplificam as consultas de estatísticas por janela temporal
-
-        # Forçar recriação das views com arredondamento completo
-        conn.execute("DROP VIEW IF EXISTS v_stats_01min")
-        conn.execute("DROP VIEW IF EXISTS v_stats_05min")
-        conn.execute("DROP VIEW IF EXISTS v_stats_15min")
-
-        # View para estatísticas de 1 minuto (com variância para detecção de anomalias)
-        # TODAS as colunas numéricas são arredondadas para 2 casas decimais
+        # AGREGADOS INCREMENTAIS POR BUCKET DE 15 SEGUNDOS
+        # Mantidos por trigger a cada INSERT em ping_results, para que as
+        # estatísticas leiam poucas linhas por target em vez dos pings brutos.
+        # O bucket é o epoch do timestamp (texto local) dividido por 15
+        buckets_exist = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ping_stats_buckets'"
+        ).fetchone()
         conn.execute("""
-            CREATE VIEW v_stats_01min AS
-            SELECT 
-                pt.target_id,
-                ROUND(AVG(CASE WHEN pr.success = 1 THEN pr.latency END), 2) as avg_latency,
-                ROUND(MIN(CASE WHEN pr.success = 1 THEN pr.latency END), 2) as min_latency,
-                ROUND(MAX(CASE WHEN pr.success = 1 THEN pr.latency END), 2) as max_latency,
-                ROUND(COUNT(CASE WHEN pr.success = 1 THEN 1 END) * 100.0 / NULLIF(COUNT(pr.id), 0), 2) as success_rate,
-                COUNT(pr.id) as total_results,
-                COUNT(CASE WHEN pr.success = 1 THEN 1 END) as success_results,
-                COUNT(CASE WHEN pr.success = 0 THEN 1 END) as fail_results,
-                ROUND((
-                    SELECT AVG((pr2.latency - sub.avg_latency) * (pr2.latency - sub.avg_latency))
-                    FROM ping_results pr2, (
-                        SELECT AVG(CASE WHEN success = 1 THEN latency END) as avg_latency
-                        FROM ping_results 
-                        WHERE target_id = pt.target_id AND success = 1 
-                        AND julianday(timestamp) >= julianday('now', 'localtime', '-1 minute')
-                    ) sub
-                    WHERE pr2.target_id = pt.target_id AND pr2.success = 1 
-                    AND julianday(pr2.timestamp) >= julianday('now', 'localtime', '-1 minute')
-                ), 2) as variance
-            FROM ping_targets pt
-            LEFT JOIN ping_results pr ON pt.target_id = pr.target_id 
-                AND julianday(pr.timestamp) >= julianday('now', 'localtime', '-1 minute')
-            GROUP BY pt.target_id
+            CREATE TABLE IF NOT EXISTS ping_stats_buckets (
+                target_id INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,            -- epoch / 15
+                total INTEGER NOT NULL,             -- Total de tentativas
+                ok INTEGER NOT NULL,                -- Total de sucessos
+                n_lat INTEGER NOT NULL,             -- Sucessos com latência
+                sum_lat REAL NOT NULL,              -- Soma das latências
+                sum_sq REAL NOT NULL,               -- Soma dos quadrados
+                PRIMARY KEY (target_id, bucket)
+            ) WITHOUT ROWID
         """)
-
-        # View para estatísticas de 5 minutos
-        # TODAS as colunas numéricas são arredondadas para 2 casas decimais
+        if not buckets_exist:
+            # Banco existente: reconstrói os buckets da janela de 15 minutos
+            conn.execute("""
+                INSERT INTO ping_stats_buckets
+                SELECT
+                    target_id,
+                    CAST(strftime('%s', timestamp) AS INTEGER) / 15,
+                    COUNT(*),
+                    COUNT(CASE WHEN success = 1 THEN 1 END),
+                    COUNT(CASE WHEN success = 1 THEN latency END),
+                    COALESCE(SUM(CASE WHEN success = 1 THEN latency END), 0),
+                    COALESCE(SUM(CASE WHEN success = 1 THEN latency * latency END), 0)
+                FROM ping_results
+                WHERE timestamp >= datetime('now', 'localtime', '-15 minutes')
+                GROUP BY 1, 2
+            """)
         conn.execute("""
-            CREATE VIEW v_stats_05min AS
-            SELECT 
-                pt.target_id,
-                ROUND(AVG(CASE WHEN pr.success = 1 THEN pr.latency END), 2) as avg_latency,
-                ROUND(MIN(CASE WHEN pr.success = 1 THEN pr.latency END), 2) as min_latency,
-                ROUND(MAX(CASE WHEN pr.success = 1 THEN pr.latency END), 2) as max_latency,
-                ROUND(COUNT(CASE WHEN pr.success = 1 THEN 1 END) * 100.0 / NULLIF(COUNT(pr.id), 0), 2) as success_rate,
-                COUNT(pr.id) as total_results,
-                COUNT(CASE WHEN pr.success = 1 THEN 1 END) as success_results,
-                COUNT(CASE WHEN pr.success = 0 THEN 1 END) as fail_results
-            FROM ping_targets pt
-            LEFT JOIN ping_results pr ON pt.target_id = pr.target_id 
-                AND julianday(pr.timestamp) >= julianday('now', 'localtime', '-5 minutes')
-            GROUP BY pt.target_id
+            CREATE TRIGGER IF NOT EXISTS trg_ping_results_buckets
+            AFTER INSERT ON ping_results
+            BEGIN
+                INSERT INTO ping_stats_buckets
+                    (target_id, bucket, total, ok, n_lat, sum_lat, sum_sq)
+                VALUES (
+                    NEW.target_id,
+                    CAST(strftime('%s', NEW.timestamp) AS INTEGER) / 15,
+                    1,
+                    NEW.success = 1,
+                    NEW.success = 1 AND NEW.latency IS NOT NULL,
+                    CASE WHEN NEW.success = 1 THEN COALESCE(NEW.latency, 0) ELSE 0 END,
+                    CASE WHEN NEW.success = 1 THEN COALESCE(NEW.latency * NEW.latency, 0) ELSE 0 END
+                )
+                ON CONFLICT (target_id, bucket) DO UPDATE SET
+                    total = total + 1,
+                    ok = ok + excluded.ok,
+                    n_lat = n_lat + excluded.n_lat,
+                    sum_lat = sum_lat + excluded.sum_lat,
+                    sum_sq = sum_sq + excluded.sum_sq;
+            END
         """)
 
-        # View para estatísticas de 15 minutos
-        # TODAS as colunas numéricas são arredondadas para 2 casas decimais
-        conn.execute("""
-            CREATE VIEW v_stats_15min AS
-            SELECT 
-                pt.target_id,
-                ROUND(AVG(CASE WHEN pr.success = 1 THEN pr.latency END), 2) as avg_latency,
-                ROUND(MIN(CASE WHEN pr.success = 1 THEN pr.latency END), 2) as min_latency,
-                ROUND(MAX(CASE WHEN pr.success = 1 THEN pr.latency END), 2) as max_latency,
-                ROUND(COUNT(CASE WHEN pr.success = 1 THEN 1 END) * 100.0 / NULLIF(COUNT(pr.id), 0), 2) as success_rate,
-                COUNT(pr.id) as total_results,
-                COUNT(CASE WHEN pr.success = 1 THEN 1 END) as success_results,
-                COUNT(CASE WHEN pr.success = 0 THEN 1 END) as fail_results
-            FROM ping_targets pt
-            LEFT JOIN ping_results pr ON pt.target_id = pr.target_id 
-                AND julianday(pr.timestamp) >= julianday('now', 'localtime', '-15 minutes')
-            GROUP BY pt.target_id
-        """)
+        # As antigas views por janela (1/5/15 min) foram substituídas pelos
+        # buckets acima, lidos por STATS_WINDOWS_QUERY
+        conn.execute("DROP VIEW IF EXISTS v_stats_01min")
+        conn.execute("DROP VIEW IF EXISTS v_stats_05min")
+        conn.execute("DROP VIEW IF EXISTS v_stats_15min")
 
         # Sincronizar targets do JSON com a tabela ping_targets
         sync_targets_to_database(conn)
@@ -283,6 +366,64 @@ def init_database():
         conn.commit()
 
 
+def get_db_connection():
+    """
+    Retorna a conexão SQLite da thread atual, criando-a na primeira chamada.
+
+    Manter a conexão aberta preserva o cache de páginas entre consultas,
+    em vez de reabrir o banco (e reaplicar os PRAGMAs) a cada operação.
+    """
+    conn = getattr(_db_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+        # OTIMIZAÇÕES PARA ANÁLISE EM TEMPO REAL
+        # auto_vacuum precisa vir antes do WAL e só vale para bancos novos
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("PRAGMA journal_mode=WAL")  # Leituras concorrentes
+        conn.execute("PRAGMA synchronous=NORMAL")  # Performance vs segurança
+        conn.execute("PRAGMA cache_size=10000")  # 10MB cache para consultas
+        conn.execute("PRAGMA mmap_size=268435456")  # 256MB lidos via mmap
+        conn.execute("PRAGMA temp_store=MEMORY")  # GROUP BY das views sem disco
+        conn.execute("PRAGMA wal_autocheckpoint=1000")  # Checkpoint a cada 1000 páginas
+        _db_local.conn = conn
+        _db_connections.append((threading.current_thread(), conn))
+    return conn
+
+
+def close_db_connections():
+    """
+    Encerra o acesso ao banco ao sair do programa.
+
+    A db_writer é parada antes (gravando o último lote); só são fechadas as
+    conexões da thread atual ou de threads já finalizadas, pois as threads
+    daemon restantes podem estar no meio de uma consulta.
+    """
+    if _writer_thread is not None and _writer_thread.is_alive():
+        ping_write_queue.put(_WRITER_STOP)
+        _writer_thread.join(timeout=DB_WRITE_INTERVAL + 5)
+
+    current = threading.current_thread()
+    for owner, conn in _db_connections:
+        if owner is current or not owner.is_alive():
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+    # Atualiza as estatísticas do planejador numa conexão própria e curta
+    try:
+        conn = sqlite3.connect(DB_FILE)
+        try:
+            conn.execute("PRAGMA optimize")
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        pass
+
+
+atexit.register(close_db_connections)
+
+
 def sync_targets_to_database(conn):
     """Sincroniza os targets do monitoring.json com a tabela ping_targets"""
 
@@ -304,129 +445,283 @@ def sync_targets_to_database(conn):
 
 
 # Função para salvar resultado de ping no banco
-def save_ping_result(target_id, success, latency=None, ttl=None, bytes_val=None):
-    """Salva um resultado de ping no banco SQLite"""
-    db_file = os.path.join(SCRIPT_DIR, "icmp_monitor.sqlite3")
+def save_ping_result(
+    target_id, success, latency=None, ttl=None, bytes_val=None, timestamp=None
+):
+    """Enfileira um resultado de ping para gravação em lote no banco SQLite"""
+    if timestamp is None:
+        timestamp = datetime.now()
+    ping_write_queue.put((target_id, timestamp, success, latency, ttl, bytes_val))
 
-    try:
-        with db_lock:
-            with sqlite3.connect(db_file) as conn:
+
+def db_writer():
+    """
+    Thread única de escrita dos resultados de ping.
+
+    Os pings de todos os targets são acumulados por DB_WRITE_INTERVAL e
+    gravados com um único executemany + commit, em vez de uma conexão e um
+    commit por ping. Termina ao receber _WRITER_STOP, após gravar o lote
+    pendente.
+    """
+    conn = get_db_connection()
+
+    stop = False
+    while not stop:
+        try:
+            item = ping_write_queue.get()
+            if item is _WRITER_STOP:
+                break
+            batch = [item]
+            time.sleep(DB_WRITE_INTERVAL)
+            try:
+                while True:
+                    item = ping_write_queue.get_nowait()
+                    if item is _WRITER_STOP:
+                        stop = True
+                        break
+                    batch.append(item)
+            except queue.Empty:
+                pass
+
+            conn.executemany(
+                """
+                INSERT INTO ping_results (target_id, timestamp, success, latency, ttl, bytes)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """,
+                batch,
+            )
+            conn.commit()
+        except KeyboardInterrupt:
+            break
+        except Exception as e:
+            console.print(f"[red]Erro ao salvar no banco: {e}[/]")
+
+
+def cleanup_database():
+    """
+    Remove periodicamente os resultados com mais de 7 dias.
+
+    Roda a cada DB_CLEANUP_INTERVAL em thread própria, fora do ciclo de
+    estatísticas. O filtro direto em timestamp usa o índice
+    idx_ping_results_timestamp; em seguida as páginas livres são devolvidas
+    (incremental_vacuum) e o WAL é truncado.
+    """
+    while True:
+        try:
+            with get_db_connection() as conn:
                 conn.execute(
-                    """
-                    INSERT INTO ping_results (target_id, timestamp, success, latency, ttl, bytes)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                    (target_id, datetime.now(), success, latency, ttl, bytes_val),
+                    "DELETE FROM ping_results WHERE timestamp < datetime('now', 'localtime', '-7 days')"
                 )
-                conn.commit()
-    except Exception as e:
-        console.print(f"[red]Erro ao salvar no banco: {e}[/]")
+                # Buckets só são lidos na janela de 15 minutos
+                conn.execute(
+                    "DELETE FROM ping_stats_buckets WHERE bucket < CAST(strftime('%s', 'now', 'localtime', '-15 minutes') AS INTEGER) / 15"
+                )
+            # executescript roda o PRAGMA até o fim (execute libera só 1 página)
+            conn.executescript("PRAGMA incremental_vacuum")
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except KeyboardInterrupt:
+            break
+        except Exception as e:
+            console.print(f"[red]Erro na limpeza do banco: {e}[/]")
+        time.sleep(DB_CLEANUP_INTERVAL)
 
 
-def run_ping_command(address_ip):
-    """Executa o comando ping e retorna o resultado."""
+async def run_ping_command(address_ip):
+    """Inicia um processo ping contínuo (asyncio) e retorna o processo.
+
+    Um único ping por target envia um pacote a cada PING_UPDATE_INTERVAL e
+    escreve uma linha por resposta; com -O, pacotes sem resposta geram a
+    linha "no answer yet", evitando um fork/exec por ping.
+    """
     if not shutil.which("ping"):
         raise FileNotFoundError("O comando 'ping' não foi encontrado no sistema.")
 
-    return subprocess.run(
-        ["ping", "-c", "1", address_ip],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
+    return await asyncio.create_subprocess_exec(
+        "ping",
+        "-O",
+        "-n",
+        "-i",
+        str(PING_UPDATE_INTERVAL),
+        address_ip,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
     )
 
 
-def parse_ping_output(output):
-    """Analisa a saída do ping e extrai as estatísticas."""
-    time_stats = "-"
-    ttl_value = "-"
-    bytes_value = "-"
+def format_clock(now):
+    """Formata HH:MM:SS.mmm sem strftime (chamado a cada resposta de ping)"""
+    return (
+        f"{now.hour:02d}:{now.minute:02d}:{now.second:02d}"
+        f".{now.microsecond // 1000:03d}"
+    )
 
-    for line in output.splitlines():
-        if "time=" in line:
-            time_part = line.split("time=")[1].strip()
+
+def terminate_ping_processes():
+    """Encerra os processos ping contínuos para não deixá-los órfãos"""
+    for process in list(_ping_processes):
+        if process.returncode is None:
             try:
-                time_value = float(time_part.split()[0])
-                time_stats = f"{time_value:.1f}"
-            except (ValueError, IndexError):
-                time_stats = "-"
-        if "ttl=" in line:
-            ttl_value = line.split("ttl=")[1].split()[0]
-        if "bytes from" in line:
-            bytes_value = line.split()[0]
+                process.terminate()
+            except ProcessLookupError:
+                pass
+
 
-    return time_stats, ttl_value, bytes_value
+atexit.register(terminate_ping_processes)
+
+
+def parse_ping_output(output):
+    """Analisa a saída do ping e extrai as estatísticas."""
+    match = _PING_RE.search(output)
+    if match is None:
+        return "-", "-", "-"
+    return f"{float(match['time']):.1f}", match["ttl"], match["bytes"]
 
 
-# Função para executar o ping e retornar o resultado
-def ping_address(address_obj, results):
+# Corrotina que acompanha o ping de um target e atualiza o resultado
+async def ping_address(address_obj, results):
     address_ip = address_obj["addr"]
     target_id = address_obj["id"]
 
     # Resolver DNS se não for IPv4
     resolved_ip = None
-    if not is_ipv4(address_ip):
-        resolved_ip = resolve_dns(address_ip)
+    is_hostname = not is_ipv4(address_ip)
+    if is_hostname:
+        resolved_ip = await asyncio.to_thread(resolve_dns, address_ip)
         if resolved_ip is None:
             # DNS falhou, marcar como erro
-            failed_timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+            failed_timestamp = format_clock(datetime.now())
             results[target_id] = {
                 "pong": "DNS Error",
                 "bytes": "-",
                 "ttl": "-",
-                "time": "-",
+                "time": None,
                 "timestamp": f"dns_fail:{failed_timestamp}",
                 "address_obj": address_obj,
                 "resolved_ip": None,
             }
-            time.sleep(PING_UPDATE_INTERVAL)
+            mark_dirty()
+            await asyncio.sleep(PING_UPDATE_INTERVAL)
             return
+    # O ping contínuo quase nunca reinicia: o IP é revalidado a cada TTL
+    dns_expires = time.monotonic() + DNS_CACHE_TTL
 
-    while True:
-        try:
-            result = run_ping_command(address_ip)
+    def register_failure(now):
+        save_ping_result(target_id, False, timestamp=now)
 
-            if result.returncode == 0:
-                response_timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-                time_stats, ttl_value, bytes_value = parse_ping_output(result.stdout)
+        results[target_id] = {
+            "pong": "Error",
+            "bytes": "-",
+            "ttl": "-",
+            "time": None,
+            "timestamp": f"fail:{format_clock(now)}",
+            "address_obj": address_obj,
+            "resolved_ip": resolved_ip,
+        }
+        mark_dirty()
 
-                try:
-                    latency_value = float(time_stats) if time_stats != "-" else None
-                    ttl_int = int(ttl_value) if ttl_value != "-" else None
-                    bytes_int = int(bytes_value) if bytes_value != "-" else None
-                    save_ping_result(target_id, True, latency_value, ttl_int, bytes_int)
-                except (ValueError, TypeError):
-                    save_ping_result(target_id, True)
-
-                results[target_id] = {
-                    "pong": "Yes",
-                    "bytes": bytes_value,
-                    "ttl": ttl_value,
-                    "time": time_stats,
-                    "timestamp": response_timestamp,
-                    "address_obj": address_obj,
-                    "resolved_ip": resolved_ip,
-                }
-            else:
-                failed_timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-                save_ping_result(target_id, False)
-
-                results[target_id] = {
-                    "pong": "Error",
-                    "bytes": "-",
-                    "ttl": "-",
-                    "time": "-",
-                    "timestamp": f"fail:{failed_timestamp}",
-                    "address_obj": address_obj,
-                    "resolved_ip": resolved_ip,
-                }
-            time.sleep(PING_UPDATE_INTERVAL)
+    while True:
+        process = None
+        try:
+            # Ao reiniciar o ping, a resolução vem do cache (DNS_CACHE_TTL);
+            # se falhar, mantém o último IP conhecido
+            if is_hostname:
+                resolved_ip = (
+                    await asyncio.to_thread(resolve_dns, address_ip) or resolved_ip
+                )
+            process = await run_ping_command(resolved_ip or address_ip)
+            _ping_processes.add(process)
+            ip_changed = False
+
+            # Cada linha corresponde a um pacote enviado (resposta ou falha)
+            async for raw_line in process.stdout:
+                line = raw_line.decode(errors="replace")
+                # Mesmo instante para o banco e para a exibição
+                now = datetime.now()
+                if "bytes from" in line:
+                    if "(DUP!)" in line:
+                        continue
+
+                    time_stats, ttl_value, bytes_value = parse_ping_output(line)
+
+                    latency_value = None
+                    try:
+                        latency_value = float(time_stats) if time_stats != "-" else None
+                        ttl_int = int(ttl_value) if ttl_value != "-" else None
+                        bytes_int = int(bytes_value) if bytes_value != "-" else None
+                        save_ping_result(
+                            target_id,
+                            True,
+                            latency_value,
+                            ttl_int,
+                            bytes_int,
+                            timestamp=now,
+                        )
+                    except (ValueError, TypeError):
+                        save_ping_result(target_id, True, timestamp=now)
+
+                    results[target_id] = {
+                        "pong": "Yes",
+                        "bytes": bytes_value,
+                        "ttl": ttl_value,
+                        "time": latency_value,  # float em ms ou None
+                        "timestamp": format_clock(now),
+                        "address_obj": address_obj,
+                        "resolved_ip": resolved_ip,
+                    }
+                    mark_dirty()
+                elif "icmp_seq=" in line:
+                    # "no answer yet for icmp_seq=N", "Destination Host Unreachable"...
+                    register_failure(now)
+
+                if is_hostname and time.monotonic() >= dns_expires:
+                    dns_expires = time.monotonic() + DNS_CACHE_TTL
+                    new_ip = await asyncio.to_thread(resolve_dns, address_ip)
+                    if new_ip and new_ip != resolved_ip:
+                        # Registro DNS mudou: reinicia o ping no novo IP
+                        resolved_ip = new_ip
+                        ip_changed = True
+                        process.terminate()
+                        break
+
+            await process.wait()
+            _ping_processes.discard(process)
+            if ip_changed:
+                continue
+            # O ping terminou (ex.: rede indisponível): registra falha e reinicia
+            register_failure(datetime.now())
+            await asyncio.sleep(PING_UPDATE_INTERVAL)
         except FileNotFoundError as e:
             console.print(f"[red]Erro: {e}[/]")
-            # Interrompe a thread se o ping não for encontrado
-            break
-        except KeyboardInterrupt:
+            # Interrompe o monitoramento se o ping não for encontrado
             break
+        except Exception:
+            # Falha isolada deste target: as demais corrotinas do gather
+            # seguem rodando; marca erro e tenta de novo
+            if process is not None and process.returncode is None:
+                try:
+                    process.terminate()
+                except ProcessLookupError:
+                    pass
+                await process.wait()
+            _ping_processes.discard(process)
+            register_failure(datetime.now())
+            await asyncio.sleep(PING_UPDATE_INTERVAL)
+
+
+def run_ping_loop(results):
+    """
+    Executa os pings de todos os targets em um único event loop asyncio.
+
+    Substitui uma thread por target: todos os processos ping são
+    acompanhados pela mesma thread, que apenas aguarda as linhas de saída.
+    """
+
+    async def ping_all():
+        await asyncio.gather(
+            *(ping_address(address_obj, results) for address_obj in addresses)
+        )
+
+    asyncio.run(ping_all())
 
 
 # =============================================================================
@@ -443,6 +738,44 @@ def ping_address(address_obj, results):
 # conforme mais dados se tornam disponíveis.
 
 
+# Estatísticas das três janelas em uma única consulta sobre ping_stats_buckets:
+# média = soma / n e variância = E[x²] - E[x]², a partir das somas acumuladas.
+# Cada janela é filtrada com CASE pelo bucket inicial (:b1, :b5, :b15), com
+# resolução de 15 segundos; valores com 2 casas decimais
+STATS_WINDOWS_QUERY = """
+    SELECT
+        pt.target_id,
+        -- Janela de 1 minuto (com variância para detecção de anomalias)
+        ROUND(SUM(CASE WHEN b.bucket >= :b1 THEN b.sum_lat END)
+            / NULLIF(SUM(CASE WHEN b.bucket >= :b1 THEN b.n_lat END), 0), 2),
+        ROUND(SUM(CASE WHEN b.bucket >= :b1 THEN b.ok END) * 100.0
+            / NULLIF(SUM(CASE WHEN b.bucket >= :b1 THEN b.total END), 0), 2),
+        COALESCE(SUM(CASE WHEN b.bucket >= :b1 THEN b.total END), 0),
+        ROUND(MAX(
+            SUM(CASE WHEN b.bucket >= :b1 THEN b.sum_sq END)
+            / NULLIF(SUM(CASE WHEN b.bucket >= :b1 THEN b.n_lat END), 0)
+            - (SUM(CASE WHEN b.bucket >= :b1 THEN b.sum_lat END)
+               / NULLIF(SUM(CASE WHEN b.bucket >= :b1 THEN b.n_lat END), 0))
+            * (SUM(CASE WHEN b.bucket >= :b1 THEN b.sum_lat END)
+               / NULLIF(SUM(CASE WHEN b.bucket >= :b1 THEN b.n_lat END), 0)),
+        0), 2),
+        -- Janela de 5 minutos
+        ROUND(SUM(CASE WHEN b.bucket >= :b5 THEN b.sum_lat END)
+            / NULLIF(SUM(CASE WHEN b.bucket >= :b5 THEN b.n_lat END), 0), 2),
+        ROUND(SUM(CASE WHEN b.bucket >= :b5 THEN b.ok END) * 100.0
+            / NULLIF(SUM(CASE WHEN b.bucket >= :b5 THEN b.total END), 0), 2),
+        COALESCE(SUM(CASE WHEN b.bucket >= :b5 THEN b.total END), 0),
+        -- Janela de 15 minutos
+        ROUND(SUM(b.sum_lat) / NULLIF(SUM(b.n_lat), 0), 2),
+        ROUND(SUM(b.ok) * 100.0 / NULLIF(SUM(b.total), 0), 2),
+        COALESCE(SUM(b.total), 0)
+    FROM ping_targets pt
+    LEFT JOIN ping_stats_buckets b ON pt.target_id = b.target_id
+        AND b.bucket >= :b15
+    GROUP BY pt.target_id
+"""
+
+
 def calculate_statistics():
     """
     Calcula estatísticas adaptativas baseadas em janelas temporais curtas
@@ -454,119 +787,109 @@ def calculate_statistics():
     - 15 minutos: Classificação completa do estado
     """
     global stats_data
-    db_file = os.path.join(SCRIPT_DIR, "icmp_monitor.sqlite3")
 
     while True:
         try:
-            with db_lock:
-                with sqlite3.connect(db_file) as conn:
-                    # Limpar dados com mais de 7 dias para manter base pequena
-                    # Usa julianday para comparação independente do formato de timestamp
-                    conn.execute(
-                        "DELETE FROM ping_results WHERE julianday(timestamp) < julianday('now', 'localtime', '-7 days')"
-                    )
-
-                    new_stats = {}
-
-                    # Para cada target_id, calcular estatísticas em múltiplas janelas
-                    target_ids = [addr["id"] for addr in addresses]
-
-                    for target_id in target_ids:
-                        # JANELA DE 1 MINUTO - Para detecção imediata de problemas (usando view otimizada)
-                        cursor_1m = conn.execute(
-                            """
-                            SELECT avg_latency, success_rate, total_results, variance
-                            FROM v_stats_01min WHERE target_id = ?
-                        """,
-                            (target_id,),
-                        )
-
-                        result_1m = cursor_1m.fetchone()
-
-                        # JANELA DE 5 MINUTOS - Para análise de tendência (usando view otimizada)
-                        cursor_5m = conn.execute(
-                            """
-                            SELECT avg_latency, success_rate, total_results
-                            FROM v_stats_05min WHERE target_id = ?
-                        """,
-                            (target_id,),
-                        )
-
-                        result_5m = cursor_5m.fetchone()
-
-                        # JANELA DE 15 MINUTOS - Para classificação completa (usando view otimizada)
-                        cursor_15m = conn.execute(
-                            """
-                            SELECT avg_latency, success_rate, total_results
-                            FROM v_stats_15min WHERE target_id = ?
-                        """,
-                            (target_id,),
-                        )
-
-                        result_15m = cursor_15m.fetchone()
+            with get_db_connection() as conn:
+                new_stats = {}
+
+                # Bucket inicial de cada janela, calculado como no trigger:
+                # epoch do horário local (tratado como UTC) dividido por 15
+                epoch = int(datetime.now().replace(tzinfo=timezone.utc).timestamp())
+                windows = {
+                    f"b{minutes}": (epoch - minutes * 60) // 15
+                    for minutes in (1, 5, 15)
+                }
+                rows = {
+                    row[0]: row for row in conn.execute(STATS_WINDOWS_QUERY, windows)
+                }
 
-                        # ALGORITMO DE DETECÇÃO ADAPTATIVA
-                        # Escolhe a melhor janela disponível baseada na quantidade de dados
-                        avg_latency, success_rate, total_results, std_dev = (
-                            None,
-                            0.0,
-                            0,
-                            0.0,
-                        )
-                        window_used = "collecting"
-
-                        if (
-                            result_15m and result_15m[2] >= 10
-                        ):  # 15min com dados suficientes
-                            avg_latency, success_rate, total_results = result_15m
-                            window_used = "15min"
-                        elif result_5m and result_5m[2] >= 5:  # 5min com dados mínimos
-                            avg_latency, success_rate, total_results = result_5m
-                            window_used = "5min"
-                        elif (
-                            result_1m and result_1m[2] >= 2
-                        ):  # 1min com pelo menos 2 pings
-                            avg_latency, success_rate, total_results = result_1m[:3]
-                            # Calcular desvio padrão apenas se temos dados suficientes
-                            if result_1m[3] is not None:
-                                std_dev = (
-                                    (result_1m[3] ** 0.5) if result_1m[3] > 0 else 0.0
-                                )
-                            window_used = "1min"
-
-                        new_stats[target_id] = {
-                            "avg_latency": round(avg_latency, 2)
-                            if avg_latency
-                            else None,
-                            "success_rate": round(success_rate, 2)
-                            if success_rate
-                            else 0.0,
-                            "total_results": total_results,
-                            "std_dev": round(std_dev, 2),
-                            "window_used": window_used,
-                        }
-
-                    # Atualizar variável global para uso na interface
-                    stats_data = new_stats
-
-                    # Persistir estatísticas no banco para análises futuras
-                    for target_id, stats in new_stats.items():
-                        conn.execute(
-                            """
-                            INSERT OR REPLACE INTO ping_stats 
-                            (target_id, avg_latency, success_rate, total_results, last_updated)
-                            VALUES (?, ?, ?, ?, ?)
-                        """,
-                            (
-                                target_id,
-                                stats["avg_latency"],
-                                stats["success_rate"],
-                                stats["total_results"],
-                                datetime.now(),
-                            ),
+                # Para cada target_id, escolher a janela com dados suficientes
+                target_ids = [addr["id"] for addr in addresses]
+
+                for target_id in target_ids:
+                    row = rows.get(target_id)
+                    result_1m = row[1:5] if row else None
+                    result_5m = row[5:8] if row else None
+                    result_15m = row[8:11] if row else None
+
+                    # ALGORITMO DE DETECÇÃO ADAPTATIVA
+                    # Escolhe a melhor janela disponível baseada na quantidade de dados
+                    avg_latency, success_rate, total_results, std_dev = (
+                        None,
+                        0.0,
+                        0,
+                        0.0,
+                    )
+                    window_used = "collecting"
+
+                    if (
+                        result_15m and result_15m[2] >= 10
+                    ):  # 15min com dados suficientes
+                        avg_latency, success_rate, total_results = result_15m
+                        window_used = "15min"
+                    elif result_5m and result_5m[2] >= 5:  # 5min com dados mínimos
+                        avg_latency, success_rate, total_results = result_5m
+                        window_used = "5min"
+                    elif result_1m and result_1m[2] >= 2:  # 1min com pelo menos 2 pings
+                        avg_latency, success_rate, total_results = result_1m[:3]
+                        # Calcular desvio padrão apenas se temos dados suficientes
+                        if result_1m[3] is not None:
+                            std_dev = (result_1m[3] ** 0.5) if result_1m[3] > 0 else 0.0
+                        window_used = "1min"
+
+                    # Valores já chegam arredondados pelo ROUND da consulta;
+                    # a formatação para exibição fica com a interface
+                    new_stats[target_id] = {
+                        "avg_latency": avg_latency,
+                        "success_rate": success_rate or 0.0,
+                        "total_results": total_results,
+                        "std_dev": std_dev,
+                        "window_used": window_used,
+                        # Limites do Z-score já convertidos para ms (limite *
+                        # desvio padrão): a interface só compara |atual - média|
+                        "z_bounds": (
+                            tuple(t * std_dev for t in _Z_THRESHOLDS)
+                            if std_dev > 0
+                            else None
+                        ),
+                    }
+
+                # Atualizar variável global para uso na interface
+                stats_data = new_stats
+                mark_dirty()
+
+                # Persistir estatísticas no banco para análises futuras
+                # Targets sem mudança não são reescritos (last_updated marca a
+                # última alteração dos valores)
+                updated_at = datetime.now()
+                conn.executemany(
+                    """
+                    INSERT INTO ping_stats
+                    (target_id, avg_latency, success_rate, total_results, last_updated)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (target_id) DO UPDATE SET
+                        avg_latency = excluded.avg_latency,
+                        success_rate = excluded.success_rate,
+                        total_results = excluded.total_results,
+                        last_updated = excluded.last_updated
+                    WHERE avg_latency IS NOT excluded.avg_latency
+                        OR success_rate IS NOT excluded.success_rate
+                        OR total_results IS NOT excluded.total_results
+                """,
+                    [
+                        (
+                            target_id,
+                            stats["avg_latency"],
+                            stats["success_rate"],
+                            stats["total_results"],
+                            updated_at,
                         )
+                        for target_id, stats in new_stats.items()
+                    ],
+                )
 
-                    conn.commit()
+                conn.commit()
 
             time.sleep(15)  # Recalcular a cada 15 segundos
         except KeyboardInterrupt:
@@ -579,7 +902,7 @@ def calculate_statistics():
 # Função para buscar o IP público
 def fetch_public_ip():
     try:
-        response = requests.get("https://api.ipify.org")
+        response = _ip_session.get("https://api.ipify.org", timeout=PUBLIC_IP_TIMEOUT)
         response.raise_for_status()  # Raise an exception for HTTP errors
         return response.text.strip()
     except requests.exceptions.RequestException as e:
@@ -590,17 +913,49 @@ def fetch_public_ip():
 # Função para atualizar o IP público a cada 60 segundos
 def update_public_ip():
     global public_ip
+    last_interfaces = None
+    last_fetch = 0.0
     while True:
         try:
-            public_ip = fetch_public_ip()
+            # Só consulta a API se as interfaces locais mudaram, se a última
+            # consulta falhou ou se o resultado passou de PUBLIC_IP_MAX_AGE
+            interfaces = tuple(network_interfaces)
+            now = time.monotonic()
+            if (
+                interfaces != last_interfaces
+                or public_ip == "Unknown"
+                or now - last_fetch >= PUBLIC_IP_MAX_AGE
+            ):
+                public_ip = fetch_public_ip()
+                mark_dirty()
+                last_interfaces = interfaces
+                last_fetch = now
             time.sleep(PUBLIC_IP_UPDATE_INTERVAL)
         except KeyboardInterrupt:
             break
 
 
-# Função para atualizar as interfaces de rede e seus IPv4 a cada 30 segundos
+def open_netlink_socket():
+    """
+    Abre um socket netlink inscrito em mudanças de link e de endereços IPv4.
+
+    Disponível apenas no Linux; retorna None se não puder ser aberto, caso
+    em que as interfaces voltam a ser consultadas periodicamente.
+    """
+    if not hasattr(socket, "AF_NETLINK"):
+        return None
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+        sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR))
+    except OSError:
+        return None
+    return sock
+
+
+# Função para atualizar as interfaces de rede e seus IPv4 quando mudarem
 def update_network_interfaces():
     global network_interfaces
+    netlink = open_netlink_socket()
     while True:
         try:
             interfaces = []
@@ -611,80 +966,143 @@ def update_network_interfaces():
                         interfaces.append((interface_name, addr.address))
                         break  # Pegar apenas o primeiro IPv4 por interface
             network_interfaces = interfaces
-            time.sleep(INTERFACE_UPDATE_INTERVAL)
+            mark_dirty()
+
+            if netlink is None:
+                # Sem netlink: volta ao polling periódico
+                time.sleep(INTERFACE_UPDATE_INTERVAL)
+                continue
+
+            # Aguarda uma mudança de interface/endereço; sem eventos, nada a fazer
+            timeout = None
+            deadline = None
+            try:
+                while select.select([netlink], [], [], timeout)[0]:
+                    netlink.recv(65536)
+                    # Agrupa rajadas de eventos (link up, novo endereço...) em um
+                    # scan, sem adiar além de NETLINK_MAX_DELAY (ex.: veth de
+                    # containers subindo sem parar)
+                    now = time.monotonic()
+                    if deadline is None:
+                        deadline = now + NETLINK_MAX_DELAY
+                    timeout = min(NETLINK_DEBOUNCE, deadline - now)
+                    if timeout <= 0:
+                        break
+            except OSError:
+                # Ex.: ENOBUFS quando eventos foram descartados pelo kernel;
+                # reabre o socket (ou volta ao polling) e refaz o scan
+                netlink.close()
+                netlink = open_netlink_socket()
         except KeyboardInterrupt:
             break
         except Exception as e:
             console.print(f"[red]Erro ao obter interfaces de rede com psutil: {e}[/]")
             network_interfaces = [("Erro", "Erro")]
+            mark_dirty()
             time.sleep(INTERFACE_UPDATE_INTERVAL)
 
 
+# Esquemas de colunas da tabela de pings, um por faixa de largura do terminal
+def _new_ping_table_small():
+    table = Table(title="", box=TABLE_STYLE, expand=True)
+    table.add_column(
+        "Target", header_style=HEADER_STYLE, min_width=12, ratio=2, justify="right"
+    )
+    table.add_column("IP", header_style=HEADER_STYLE, min_width=8, ratio=1)
+    table.add_column("Status", header_style=HEADER_STYLE, width=6, justify="center")
+    table.add_column("ms", header_style=HEADER_STYLE, width=6, justify="right")
+    # Colunas removidas: Bytes, TTL, Avg, Timestamp
+    return table
+
+
+def _new_ping_table_medium():
+    table = Table(title="", box=TABLE_STYLE, expand=True)
+    table.add_column(
+        "Target", header_style=HEADER_STYLE, min_width=15, ratio=2, justify="right"
+    )
+    table.add_column("Address", header_style=HEADER_STYLE, min_width=12, ratio=2)
+    table.add_column("Status", header_style=HEADER_STYLE, width=6, justify="center")
+    table.add_column("TTL", header_style=HEADER_STYLE, width=4, justify="right")
+    table.add_column("Latency", header_style=HEADER_STYLE, width=8, justify="right")
+    table.add_column("Avg", header_style=HEADER_STYLE, width=6, justify="right")
+    # Colunas removidas: Bytes, Timestamp
+    return table
+
+
+def _new_ping_table_large():
+    table = Table(title="", box=TABLE_STYLE, expand=True)
+    table.add_column(
+        "Target", header_style=HEADER_STYLE, min_width=18, ratio=2, justify="right"
+    )
+    table.add_column("Address", header_style=HEADER_STYLE, min_width=15, ratio=2)
+    table.add_column("Pong", header_style=HEADER_STYLE, width=4, justify="center")
+    table.add_column("Bytes", header_style=HEADER_STYLE, width=4, justify="right")
+    table.add_column("TTL", header_style=HEADER_STYLE, width=4, justify="right")
+    table.add_column(
+        "Latency (ms)", header_style=HEADER_STYLE, width=5, justify="right"
+    )
+    table.add_column("Avg (ms)", header_style=HEADER_STYLE, width=5, justify="left")
+    table.add_column("Timestamp", header_style=HEADER_STYLE, width=12)
+    return table
+
+
+_PING_TABLE_FACTORIES = {
+    "small": _new_ping_table_small,
+    "medium": _new_ping_table_medium,
+    "large": _new_ping_table_large,
+}
+
+
+def ping_table_size(width):
+    """Faixa de layout adaptativo para a largura do terminal"""
+    if width < 80:
+        return "small"
+    if width < 120:
+        return "medium"
+    return "large"
+
+
+# Faixa atual, recalculada só quando o terminal é redimensionado (SIGWINCH);
+# sem o sinal (ex.: Windows) a largura é consultada a cada refresh
+_HAS_SIGWINCH = hasattr(signal, "SIGWINCH")
+_ping_table_size = ping_table_size(console.size.width)
+
+
+def _on_terminal_resize(signum, frame):
+    global _ping_table_size
+    _ping_table_size = ping_table_size(console.size.width)
+    # Sem auto refresh, o quadro antigo ficaria na tela até o próximo dado
+    mark_dirty()
+
+
 # Função para criar a tabela com os resultados de ping
 def create_ping_results_table():
-    def format_latency(raw, ok_style="green", err_style="dim"):
+    def format_latency(value, ok_style=_STYLES["green"], err_style=_STYLES["dim"]):
         """
-        Converte o valor de latência para 'NN ms'.
-        Se não for um número, devolve o raw original estilizado em vermelho.
+        Converte a latência (float em ms) para 'NN ms', descartando decimais.
+        Sem valor (None), devolve um travessão com o estilo de erro.
         """
-        try:
-            # tenta converter para float e depois inteiro (descarta decimais)
-            ms_int = int(float(raw))
-            return Text(f"{ms_int} ms", style=ok_style)
-        except (TypeError, ValueError):
-            # qualquer falha vira texto cru com estilo de erro
-            fallback = (
-                raw if raw not in (None, "", "-") else "—"
-            )  # travessão se vier vazio
-            return Text(fallback, style=err_style)
-
-    # Detectar tamanho do terminal para layout adaptativo
-    terminal_width = console.size.width
+        if value is None:
+            return Text("—", style=err_style)
+        return Text(f"{int(value)} ms", style=ok_style)
 
-    table = Table(title="", box=TABLE_STYLE, expand=True)
+    # Esquema de colunas conforme a faixa de largura do terminal
+    size = _ping_table_size if _HAS_SIGWINCH else ping_table_size(console.size.width)
+    table = _PING_TABLE_FACTORIES[size]()
 
-    # Layout adaptativo baseado na largura do terminal
-    if terminal_width < 80:  # Terminal muito pequeno
-        table.add_column(
-            "Target", header_style=HEADER_STYLE, min_width=12, ratio=2, justify="right"
-        )
-        table.add_column("IP", header_style=HEADER_STYLE, min_width=8, ratio=1)
-        table.add_column("Status", header_style=HEADER_STYLE, width=6, justify="center")
-        table.add_column("ms", header_style=HEADER_STYLE, width=6, justify="right")
-        # Colunas removidas: Bytes, TTL, Avg, Timestamp
-    elif terminal_width < 120:  # Terminal médio
-        table.add_column(
-            "Target", header_style=HEADER_STYLE, min_width=15, ratio=2, justify="right"
-        )
-        table.add_column("Address", header_style=HEADER_STYLE, min_width=12, ratio=2)
-        table.add_column("Status", header_style=HEADER_STYLE, width=6, justify="center")
-        table.add_column("TTL", header_style=HEADER_STYLE, width=4, justify="right")
-        table.add_column("Latency", header_style=HEADER_STYLE, width=8, justify="right")
-        table.add_column("Avg", header_style=HEADER_STYLE, width=6, justify="right")
-        # Colunas removidas: Bytes, Timestamp
-    else:  # Terminal grande - layout completo
-        table.add_column(
-            "Target", header_style=HEADER_STYLE, min_width=18, ratio=2, justify="right"
-        )
-        table.add_column("Address", header_style=HEADER_STYLE, min_width=15, ratio=2)
-        table.add_column("Pong", header_style=HEADER_STYLE, width=4, justify="center")
-        table.add_column("Bytes", header_style=HEADER_STYLE, width=4, justify="right")
-        table.add_column("TTL", header_style=HEADER_STYLE, width=4, justify="right")
-        table.add_column(
-            "Latency (ms)", header_style=HEADER_STYLE, width=5, justify="right"
-        )
-        table.add_column("Avg (ms)", header_style=HEADER_STYLE, width=5, justify="left")
-        table.add_column("Timestamp", header_style=HEADER_STYLE, width=12)
+    # Snapshot das estatísticas: calculate_statistics troca o dict inteiro,
+    # então todas as linhas usam a mesma versão sem precisar de lock
+    stats_snapshot = stats_data
 
     for target_id, result in results.items():
         # Definir a cor do texto com base no status do pong
         pong_status = result["pong"]
         if pong_status == "Waiting":
-            style_pong = "dim yellow"
+            style_pong = _STYLES["dim yellow"]
         elif pong_status == "Yes":
-            style_pong = "green bold"
+            style_pong = _STYLES["green bold"]
         else:
-            style_pong = "dim"
+            style_pong = _STYLES["dim"]
 
         # Obter informações do endereço
         address_obj = result["address_obj"]
@@ -703,7 +1121,7 @@ def create_ping_results_table():
 
         # TTL display without threshold coloring
         ttl_display = result["ttl"]
-        ttl_text = Text(ttl_display, style="dim")
+        ttl_text = Text(ttl_display, style=_STYLES["dim"])
 
         # =================================================================
         # ALGORITMO DE DETECÇÃO DE ANOMALIAS EM TEMPO REAL
@@ -714,53 +1132,43 @@ def create_ping_results_table():
 
         # Preparar dados para análise de anomalia
         current_latency = result["time"]
-        latency_style = "dim"  # Padrão para valores não numéricos
+        latency_style = _STYLES["dim"]  # Padrão para valores não numéricos
 
         # Obter estatísticas da janela temporal mais adequada
-        avg_time_display = "-"
+        avg_latency = None
         window_info = ""
 
-        if target_id in stats_data:
-            stats = stats_data[target_id]
+        stats = stats_snapshot.get(target_id)
+        if stats is not None:
+            avg_latency = stats["avg_latency"]
+            z_bounds = stats["z_bounds"]
+            window_used = stats["window_used"]
 
             # Mostrar média da melhor janela disponível
-            if stats["avg_latency"] is not None:
-                avg_time_display = f"{stats['avg_latency']:.2f}"
-                window_info = f" ({stats['window_used']})"
+            if avg_latency is not None:
+                window_info = f" ({window_used})"
 
             # DETECÇÃO DE ANOMALIA NO TEMPO ATUAL
             # Colorir o tempo atual (não a média) baseado em análise estatística
             if (
-                current_latency != "-"
+                current_latency is not None
                 and pong_status == "Yes"
-                and stats["avg_latency"] is not None
-                and stats["std_dev"] > 0
+                and avg_latency is not None
+                and z_bounds is not None
             ):
-                try:
-                    current_ms = float(current_latency)
-                    avg_ms = stats["avg_latency"]
-                    std_dev = stats["std_dev"]
-
-                    # Calcular Z-score: quantos desvios padrão o valor atual está da média
-                    z_score = (current_ms - avg_ms) / std_dev
-
-                    # CLASSIFICAÇÃO BASEADA EM DESVIO ESTATÍSTICO
-                    if abs(z_score) <= 1.0:  # Dentro de 1 desvio padrão
-                        latency_style = "green"  # Normal - boa performance
-                    elif abs(z_score) <= 1.5:  # Entre 1 e 1.5 desvios
-                        latency_style = "yellow"  # Variável - atenção
-                    elif abs(z_score) <= 2.0:  # Entre 1.5 e 2 desvios
-                        latency_style = "red"  # Anômalo - problema detectado
-                    else:  # Mais de 2 desvios padrão
-                        latency_style = "red bold"  # Crítico - investigar
-
-                except (ValueError, ZeroDivisionError):
-                    latency_style = "dim"
+                # Z-score: quantos desvios padrão o valor atual está da média.
+                # Os limites em ms vêm de calculate_statistics, então basta
+                # comparar o desvio absoluto (sem divisão por refresh)
+
+                # CLASSIFICAÇÃO BASEADA EM DESVIO ESTATÍSTICO (ver _Z_THRESHOLDS)
+                latency_style = _Z_STYLES[
+                    bisect.bisect_left(z_bounds, abs(current_latency - avg_latency))
+                ]
 
             elif pong_status == "Error":
-                latency_style = "red bold"  # Falha de conectividade
-            elif stats["window_used"] == "collecting":
-                latency_style = "yellow dim"  # Ainda coletando dados
+                latency_style = _STYLES["red bold"]  # Falha de conectividade
+            elif window_used == "collecting":
+                latency_style = _STYLES["yellow dim"]  # Ainda coletando dados
 
         # Formato final dos campos com estilos aplicados
         # latency_text = Text(current_latency, style=latency_style)
@@ -768,31 +1176,31 @@ def create_ping_results_table():
         # remove " ms"
 
         latency_text = format_latency(current_latency, ok_style=latency_style)
-        avg_text = format_latency(avg_time_display, ok_style=latency_style)
+        avg_text = format_latency(avg_latency, ok_style=latency_style)
 
         # Formatar timestamp baseado no status
         timestamp_display = result["timestamp"]
         if timestamp_display.startswith("fail:"):
             # Remover prefixo "fail:" e colorir
-            timestamp_text = Text(timestamp_display[5:], style="magenta bold")
+            timestamp_text = Text(timestamp_display[5:], style=_STYLES["magenta bold"])
         elif timestamp_display.startswith("dns_fail:"):
             # Remover prefixo "dns_fail:" e colorir
-            timestamp_text = Text(timestamp_display[9:], style="red bold")
+            timestamp_text = Text(timestamp_display[9:], style=_STYLES["red bold"])
         elif timestamp_display == "-":
-            timestamp_text = Text("-", style="dim")
+            timestamp_text = Text("-", style=_STYLES["dim"])
         else:
             # Timestamp normal (resposta bem-sucedida)
-            timestamp_text = Text(timestamp_display, style="green dim")
+            timestamp_text = Text(timestamp_display, style=_STYLES["green dim"])
 
         # MONTAGEM FINAL DA LINHA DA TABELA - Layout adaptativo
-        if terminal_width < 80:  # Terminal muito pequeno - 4 colunas
+        if size == "small":  # Terminal muito pequeno - 4 colunas
             table.add_row(
                 target_display,
                 ipv4_display,
                 Text(pong_status, style=style_pong),
                 latency_text,
             )
-        elif terminal_width < 120:  # Terminal médio - 6 colunas
+        elif size == "medium":  # Terminal médio - 6 colunas
             table.add_row(
                 target_display,
                 ipv4_display,
@@ -841,6 +1249,46 @@ def create_network_table():
     return table
 
 
+def create_public_ip_panel():
+    if public_ip.lower() == "unknown":
+        exibir_ip = Text("\nUnknown", style="red")
+    elif public_ip.lower() == "carregando...":
+        exibir_ip = Text("\nIdentificando...", style="yellow")
+    else:
+        exibir_ip = Text(f"\n{public_ip}", style="green bold")
+    return Panel(
+        Align.center(exibir_ip),
+        title=Text("Public IPv4 Address", style=PANELY_STYLE),
+        border_style="italic",
+    )
+
+
+def create_network_panel():
+    return Panel(
+        create_network_table(),
+        title=Text("Network Interfaces", style=PANELY_STYLE),
+        border_style="italic",
+    )
+
+
+def current_clock():
+    """Retorna 'YYYY-MM-DD HH:MM:SS', formatando só uma vez por segundo"""
+    second = int(time.time())
+    if second != _clock_cache["second"]:
+        _clock_cache["second"] = second
+        _clock_cache["text"] = datetime.fromtimestamp(second).isoformat(sep=" ")
+    return _clock_cache["text"]
+
+
+def cached_panel(name, key, build):
+    """Retorna o painel em cache para `name`, reconstruindo só se `key` mudou"""
+    cached = _panel_cache.get(name)
+    if cached is None or cached[0] != key:
+        cached = (key, build())
+        _panel_cache[name] = cached
+    return cached[1]
+
+
 # Função para atualizar o layout com os resultados de ping e rede
 def update_layout():
     layout = Layout()
@@ -868,21 +1316,10 @@ def update_layout():
     )
 
     # Atualiza a direita com dois painéis: IP público e interfaces de rede
-    if public_ip.lower() == "unknown":
-        exibir_ip = Text("\nUnknown", style="red")
-    elif public_ip.lower() == "carregando...":
-        exibir_ip = Text("\nIdentificando...", style="yellow")
-    else:
-        exibir_ip = Text(f"\n{public_ip}", style="green bold")
-    public_ip_panel = Panel(
-        Align.center(exibir_ip),
-        title=Text("Public IPv4 Address", style=PANELY_STYLE),
-        border_style="italic",
-    )
-    network_table_panel = Panel(
-        create_network_table(),
-        title=Text("Network Interfaces", style=PANELY_STYLE),
-        border_style="italic",
+    # (atualizados a cada 15s, reaproveitados enquanto os dados não mudam)
+    public_ip_panel = cached_panel("public_ip", public_ip, create_public_ip_panel)
+    network_table_panel = cached_panel(
+        "network", tuple(network_interfaces), create_network_panel
     )
 
     # constrói uma grade de 2 colunas, expansível
@@ -895,7 +1332,7 @@ def update_layout():
     info_table.add_row("User:", " Herson Melo")
     info_table.add_row(
         "Current time:",
-        Text(" " + datetime.now().strftime("%Y-%m-%d %H:%M:%S"), style="yellow"),
+        Text(" " + current_clock(), style="yellow"),
     )
 
     info_panel = Panel(
@@ -956,13 +1393,18 @@ def main():
     # Inicializar banco SQLite
     init_database()
 
+    # Iniciar thread de escrita em lote dos resultados de ping
+    global _writer_thread
+    _writer_thread = threading.Thread(target=db_writer, daemon=True)
+    _writer_thread.start()
+
     # Dicionário para armazenar resultados de ping
     results = {
         address_obj["id"]: {
             "pong": "Waiting",
             "bytes": "-",
             "ttl": "-",
-            "time": "-",
+            "time": None,
             "timestamp": "-",
             "address_obj": address_obj,
             "resolved_ip": None,
@@ -973,14 +1415,9 @@ def main():
     # Tornar results global para acesso das threads
     globals()["results"] = results
 
-    # Iniciar threads para cada endereço de ping
-    threads = []
-    for address_obj in addresses:
-        thread = threading.Thread(
-            target=ping_address, args=(address_obj, results), daemon=True
-        )
-        thread.start()
-        threads.append(thread)
+    # Iniciar thread única com o event loop dos pings de todos os endereços
+    ping_thread = threading.Thread(target=run_ping_loop, args=(results,), daemon=True)
+    ping_thread.start()
 
     # Iniciar thread para atualizar o IP público
     public_ip_thread = threading.Thread(target=update_public_ip, daemon=True)
@@ -996,13 +1433,42 @@ def main():
     stats_thread = threading.Thread(target=calculate_statistics, daemon=True)
     stats_thread.start()
 
+    # Iniciar thread de limpeza periódica do banco
+    cleanup_thread = threading.Thread(target=cleanup_database, daemon=True)
+    cleanup_thread.start()
+
+    # Recalcular o layout da tabela de pings ao redimensionar o terminal
+    if _HAS_SIGWINCH:
+        signal.signal(signal.SIGWINCH, _on_terminal_resize)
+
     # Iniciar a exibição dinâmica com rich
-    with Live(update_layout(), refresh_per_second=4, console=console) as live:
+    # Sem auto refresh: o layout só é reconstruído quando algum dado muda
+    with Live(update_layout(), auto_refresh=False, console=console) as live:
         try:
+            last_counter = _dirty_counter
+            last_render = time.monotonic()
+            # Próxima virada de segundo do relógio exibido
+            next_tick = int(time.time()) + 1
             while True:
-                time.sleep(0.5)
+                # Dorme até a próxima virada de segundo, mas nunca antes do
+                # intervalo mínimo desde o último redesenho
+                wait = max(
+                    next_tick - time.time(),
+                    last_render + UI_MIN_REFRESH_INTERVAL - time.monotonic(),
+                )
+                time.sleep(min(UI_POLL_INTERVAL, max(0.0, wait)))
+                now = time.monotonic()
+                # Mudanças dentro do intervalo mínimo são agrupadas no
+                # próximo redesenho (o contador continua acumulando)
+                if now - last_render < UI_MIN_REFRESH_INTERVAL:
+                    continue
+                if _dirty_counter == last_counter and time.time() < next_tick:
+                    continue
+                last_counter = _dirty_counter
+                last_render = now
+                next_tick = int(time.time()) + 1
                 # Atualiza o layout na tela com o tempo atual
-                live.update(update_layout())
+                live.update(update_layout(), refresh=True)
         except KeyboardInterrupt:
             print("\n[red]Exiting...[/red]")
 